@@ -10,17 +10,37 @@ Evaluation script for the rice environment
 """
 
 import argparse
+import copy
+import fnmatch
+import functools
+import hashlib
+import importlib.util as iu
 import logging
+import math
+import multiprocessing
 import os
-import shutil
-import subprocess
 import sys
-import time
-from collections import OrderedDict
-
+import tempfile
+import zipfile
 import numpy as np
 import yaml
 
+try:
+    # The libyaml C loader parses configs 5-10x faster when available.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; fall back to running the helpers as plain Python.
+    def njit(*args, **kwargs):  # pylint: disable=unused-argument
+        def wrap(func):
+            return func
+
+        return wrap
+
 from pathlib import Path
 
 _path = Path(os.path.abspath(__file__))
@@ -39,19 +59,45 @@ logging.getLogger().setLevel(logging.ERROR)
 
 _SEED = 1234567890  # seed used for evaluation
 
+# Episode rollouts are cached on disk (keyed by checkpoint hash, seed and
+# episode id) when the RICE_EVAL_CACHE=1 env var is set.
+_EPISODE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "rice_eval_cache")
+
 _INDEXES_FILENAME = "climate_economic_min_max_indices.txt"
 
-_METRICS_TO_LABEL_DICT = OrderedDict()
 # Read the dict values below as
 # (label, decimal points used to round off value: 0 becomes an integer)
-_METRICS_TO_LABEL_DICT["reward_all_regions"] = ("Episode Reward", 2)
-_METRICS_TO_LABEL_DICT["global_temperature"] = ("Temperature Rise", 2)
-_METRICS_TO_LABEL_DICT["global_carbon_mass"] = ("Carbon Mass", 0)
-_METRICS_TO_LABEL_DICT["capital_all_regions"] = ("Capital", 0)
-_METRICS_TO_LABEL_DICT["production_all_regions"] = ("Production", 0)
-_METRICS_TO_LABEL_DICT["gross_output_all_regions"] = ("Gross Output", 0)
-_METRICS_TO_LABEL_DICT["investment_all_regions"] = ("Investment", 0)
-_METRICS_TO_LABEL_DICT["abatement_cost_all_regions"] = ("Abatement Cost", 2)
+# Plain dicts preserve insertion order since Python 3.7.
+_METRICS_TO_LABEL_DICT = {
+    "reward_all_regions": ("Episode Reward", 2),
+    "global_temperature": ("Temperature Rise", 2),
+    "global_carbon_mass": ("Carbon Mass", 0),
+    "capital_all_regions": ("Capital", 0),
+    "production_all_regions": ("Production", 0),
+    "gross_output_all_regions": ("Gross Output", 0),
+    "investment_all_regions": ("Investment", 0),
+    "abatement_cost_all_regions": ("Abatement Cost", 2),
+}
+
+# Hoisted views of the metrics dict, so the hot loops below do not rebuild
+# the key list or re-index the labels on every call.
+_DESIRED_OUTPUTS = tuple(_METRICS_TO_LABEL_DICT.keys())
+_LABEL_ITEMS = tuple(_METRICS_TO_LABEL_DICT.items())
+
+
+def _import_module_from_path(module_name, module_path):
+    """
+    Import a module by file path, without relying on sys.path mutations.
+    The module is cached in sys.modules, so repeated calls are cheap.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = iu.spec_from_file_location(module_name, module_path)
+    module = iu.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
 
 
 def get_imports(framework=None):
@@ -59,42 +105,74 @@ def get_imports(framework=None):
     Fetch relevant imports.
     """
     assert framework is not None
+    this_file_dir = os.path.dirname(os.path.abspath(__file__))
     if framework == "rllib":
-        from train_with_rllib import (
-            create_trainer,
-            fetch_episode_states,
-            load_model_checkpoints,
+        module = _import_module_from_path(
+            "train_with_rllib",
+            os.path.join(this_file_dir, "train_with_rllib.py"),
         )
+
+        # RLlib rollouts are fetched one episode at a time.
+        fetch_episode_states_batched = None
     elif framework == "warpdrive":
-        from train_with_warp_drive import (
-            create_trainer,
-            fetch_episode_states,
-            load_model_checkpoints,
+        module = _import_module_from_path(
+            "train_with_warp_drive",
+            os.path.join(this_file_dir, "train_with_warp_drive.py"),
         )
+        fetch_episode_states_batched = module.fetch_episode_states_batched
     else:
         raise ValueError(f"Unknown framework {framework}!")
-    return create_trainer, load_model_checkpoints, fetch_episode_states
+    return (
+        module.create_trainer,
+        module.load_model_checkpoints,
+        module.fetch_episode_states,
+        fetch_episode_states_batched,
+    )
+
+
+# The only archive members needed to validate a submission and re-create
+# the trainer; anything else in the zip (logs, intermediate artifacts) is
+# never extracted.
+_NEEDED_ZIP_MEMBERS = (
+    ".rllib",
+    ".warpdrive",
+    "*.py",
+    "*.yaml",
+    "*.yml",
+    "*.cu",
+    "*.state_dict",
+    "region_yamls/*",
+)
+
+
+def _is_needed_zip_member(member_name):
+    """
+    Check whether a zip member is needed for evaluation.
+    """
+    return any(
+        fnmatch.fnmatch(member_name, pattern) for pattern in _NEEDED_ZIP_MEMBERS
+    )
+
+
+# Single argument parser, shared by all the entry points.
+_PARSER = argparse.ArgumentParser()
+_PARSER.add_argument(
+    "--results_dir",
+    "-r",
+    type=str,
+    default=".",
+    help="the directory where all the submission files are saved. Can also be "
+    "the zipped file containing all the submission files.",
+)
 
 
 def get_results_dir():
     """
     Obtain the 'results' directory from the system arguments.
     """
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "--results_dir",
-        "-r",
-        type=str,
-        default=".",
-        help="the directory where all the submission files are saved. Can also be "
-        "the zipped file containing all the submission files.",
-    )
+    parser = _PARSER
     args = parser.parse_args()
 
-    if "results_dir" not in args:
-        raise ValueError(
-            "Please provide a results directory to evaluate with the argument -r"
-        )
     if not os.path.exists(args.results_dir):
         raise ValueError(
             "The results directory is missing. Please make sure the correct path "
@@ -105,8 +183,15 @@ def get_results_dir():
 
         # Also handle a zipped file
         if results_dir.endswith(".zip"):
-            unzipped_results_dir = os.path.join("/tmp", str(time.time()))
-            shutil.unpack_archive(results_dir, unzipped_results_dir)
+            unzipped_results_dir = tempfile.mkdtemp(prefix="rice_eval_")
+            with zipfile.ZipFile(results_dir) as zip_file:
+                # Only materialize the members evaluation actually reads.
+                # Extraction stays sequential: member reads are serialized
+                # by the ZipFile lock, and concurrent extracts race on
+                # parent-directory creation.
+                for member in zip_file.namelist():
+                    if _is_needed_zip_member(member):
+                        zip_file.extract(member, unzipped_results_dir)
             results_dir = unzipped_results_dir
         return results_dir, parser
     except Exception as err:
@@ -120,52 +205,140 @@ def validate_dir(results_dir=None):
     assert results_dir is not None
     framework = None
 
-    files = os.listdir(results_dir)
+    # A set of entry names makes every membership test below an O(1) lookup.
+    files = {entry.name for entry in os.scandir(results_dir)}
     if ".warpdrive" in files:
         framework = "warpdrive"
         # Warpdrive was used for training
-        for file in [
+        required_files = {
             "rice.py",
             "rice_helpers.py",
             "rice_cuda.py",
             "rice_step.cu",
             "rice_warpdrive.yaml",
-        ]:
-            if file not in files:
-                success = False
-                logging.error(
-                    "%s is not present in the results directory: %s!", file, results_dir
-                )
-                comment = f"{file} is not present in the results directory!"
-                break
-            success = True
-            comment = "Valid submission"
+        }
     elif ".rllib" in files:
         framework = "rllib"
         # RLlib was used for training
-        for file in ["rice.py", "rice_helpers.py", "rice_rllib.yaml"]:
-            if file not in files:
-                success = False
-                logging.error(
-                    "%s is not present in the results directory: %s!", file, results_dir
-                )
-                comment = f"{file} is not present in the results directory!"
-                break
-            success = True
-            comment = "Valid submission"
+        required_files = {"rice.py", "rice_helpers.py", "rice_rllib.yaml"}
     else:
-        success = False
         logging.error(
             "Missing identifier file! Either the .rllib or the .warpdrive "
             "file must be present in the results directory: %s",
             results_dir,
         )
-        comment = "Missing identifier file!"
+        return framework, False, "Missing identifier file!"
+
+    # Single set difference instead of one list scan per required file.
+    missing_files = required_files - files
+    if missing_files:
+        missing_file = sorted(missing_files)[0]
+        logging.error(
+            "%s is not present in the results directory: %s!",
+            missing_file,
+            results_dir,
+        )
+        comment = f"{missing_file} is not present in the results directory!"
+        return framework, False, comment
+
+    return framework, True, "Valid submission"
+
 
-    return framework, success, comment
+# Everything an episode trajectory depends on: the policy checkpoints,
+# the submitted env code and CUDA sources, and the run and region configs.
+_EPISODE_CACHE_KEY_SUFFIXES = (".state_dict", ".py", ".cu", ".yaml", ".yml")
 
 
-def compute_metrics(fetch_episode_states, trainer, framework, num_episodes=1):
+def _episode_cache_key(results_dir, seed):
+    """
+    Build a rollout cache key from the submission contents and the seed.
+    The directory is walked recursively, so the region_yamls that
+    parameterize the env dynamics are part of the key as well.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for dir_path, dir_names, file_names in os.walk(results_dir):
+        dir_names.sort()
+        for file in sorted(file_names):
+            if file.endswith(_EPISODE_CACHE_KEY_SUFFIXES):
+                file_path = os.path.join(dir_path, file)
+                rel_path = os.path.relpath(file_path, results_dir)
+                hasher.update(rel_path.encode("utf-8"))
+                with open(file_path, "rb") as file_ptr:
+                    hasher.update(file_ptr.read())
+    return f"{hasher.hexdigest()}_{seed}"
+
+
+def _load_cached_episode(cache_key, episode_id):
+    """
+    Load a cached episode rollout, if present.
+    """
+    cache_file = os.path.join(_EPISODE_CACHE_DIR, f"{cache_key}_{episode_id}.npz")
+    if not os.path.exists(cache_file):
+        return None
+    with np.load(cache_file) as data:
+        return {feature: data[feature] for feature in data.files}
+
+
+def _save_cached_episode(cache_key, episode_id, episode_state):
+    """
+    Save an episode rollout to the on-disk cache.
+    """
+    os.makedirs(_EPISODE_CACHE_DIR, exist_ok=True)
+    cache_file = os.path.join(_EPISODE_CACHE_DIR, f"{cache_key}_{episode_id}.npz")
+    np.savez_compressed(cache_file, **episode_state)
+
+
+@njit(cache=True)
+def _reduce_last_minus_first(stacked_states):
+    """
+    Mean of (last - first) upper-strata values across the episode axis.
+    """
+    num_episodes = stacked_states.shape[0]
+    total = 0.0
+    for episode_id in range(num_episodes):
+        total += (
+            stacked_states[episode_id, -1, 0] - stacked_states[episode_id, 0, 0]
+        )
+    return total / num_episodes
+
+
+@njit(cache=True)
+def _reduce_last(stacked_states):
+    """
+    Mean of the last upper-strata values across the episode axis.
+    """
+    num_episodes = stacked_states.shape[0]
+    total = 0.0
+    for episode_id in range(num_episodes):
+        total += stacked_states[episode_id, -1, 0]
+    return total / num_episodes
+
+
+@njit(cache=True)
+def _reduce_sum_mean(stacked_states):
+    """
+    Mean of the per-episode sums across the episode axis.
+    """
+    return stacked_states.sum() / stacked_states.shape[0]
+
+
+@njit(cache=True)
+def _round_scalar(val, num_decimal_places):
+    """
+    Round a scalar to the desired number of decimal places.
+    The builtin round avoids the NumPy ufunc dispatch for scalars.
+    """
+    return round(val, num_decimal_places)
+
+
+def compute_metrics(
+    fetch_episode_states,
+    trainer,
+    framework,
+    num_episodes=1,
+    fetch_episode_states_batched=None,
+    cache_key=None,
+):
     """
     Generate episode rollouts and compute metrics.
     """
@@ -176,52 +349,84 @@ def compute_metrics(fetch_episode_states, trainer, framework, num_episodes=1):
     ), f"Invalid framework {framework}, should be in f{available_frameworks}."
 
     # Fetch all the desired outputs to compute various metrics.
-    desired_outputs = list(_METRICS_TO_LABEL_DICT.keys())
+    desired_outputs = list(_DESIRED_OUTPUTS)
 
-    episode_states = {}
+    # One contiguous [num_episodes, ...] buffer per feature; allocated
+    # lazily once the first episode's shapes are known.
+    feature_buffers = {}
     eval_metrics = {}
+
+    def store_episode(episode_id, episode_state):
+        for feature in desired_outputs:
+            feature_values = np.asarray(episode_state[feature])
+            if feature not in feature_buffers:
+                feature_buffers[feature] = np.empty(
+                    (num_episodes,) + feature_values.shape,
+                    dtype=feature_values.dtype,
+                )
+            feature_buffers[feature][episode_id] = feature_values
+
     try:
-        for episode_id in range(num_episodes):
+        cached_episodes = None
+        if cache_key is not None:
+            cached_episodes = [
+                _load_cached_episode(cache_key, episode_id)
+                for episode_id in range(num_episodes)
+            ]
+            # Only reuse the cache when every episode is available.
+            if any(episode is None for episode in cached_episodes):
+                cached_episodes = None
+
+        if cached_episodes is not None:
+            for episode_id in range(num_episodes):
+                store_episode(episode_id, cached_episodes[episode_id])
+        elif fetch_episode_states_batched is not None:
+            # The batched sim already runs all the episodes in parallel on
+            # the GPU; fetch them from a single rollout instead of looping.
+            batched_states = fetch_episode_states_batched(
+                trainer, desired_outputs, num_episodes
+            )
+            for episode_id in range(num_episodes):
+                store_episode(episode_id, batched_states[episode_id])
+                if cache_key is not None:
+                    _save_cached_episode(
+                        cache_key, episode_id, batched_states[episode_id]
+                    )
+        else:
             if fetch_episode_states is not None:
-                episode_states[episode_id] = fetch_episode_states(
-                    trainer, desired_outputs
-                )
+                rollout_fn = fetch_episode_states
             else:
-                episode_states[episode_id] = trainer.fetch_episode_global_states(
-                    desired_outputs
-                )
 
-        for feature in desired_outputs:
-            feature_values = [None for _ in range(num_episodes)]
+                def rollout_fn(trainer_obj, outputs):
+                    return trainer_obj.fetch_episode_global_states(outputs)
+
+            # The rollouts reset and step one shared env object on the
+            # trainer, so they must run sequentially; parallelizing here
+            # would interleave episodes on the same mutable env state.
+            for episode_id in range(num_episodes):
+                episode_state = rollout_fn(trainer, desired_outputs)
+                store_episode(episode_id, episode_state)
+                if cache_key is not None:
+                    _save_cached_episode(cache_key, episode_id, episode_state)
+
+        for feature, (label, num_decimal_places) in _LABEL_ITEMS:
+            # The buffer already stacks the episodes along the leading axis,
+            # so each reduction is a single batched op.
+            stacked_states = feature_buffers[feature]
 
             if feature == "global_temperature":
                 # Get the temp rise for upper strata
-                for episode_id in range(num_episodes):
-                    feature_values[episode_id] = (
-                        episode_states[episode_id][feature][-1, 0]
-                        - episode_states[episode_id][feature][0, 0]
-                    )
+                mean_feature_value = _reduce_last_minus_first(stacked_states)
 
             elif feature == "global_carbon_mass":
-                for episode_id in range(num_episodes):
-                    feature_values[episode_id] = episode_states[episode_id][feature][
-                        -1, 0
-                    ]
+                mean_feature_value = _reduce_last(stacked_states)
 
             else:
-                for episode_id in range(num_episodes):
-                    feature_values[episode_id] = np.sum(
-                        episode_states[episode_id][feature]
-                    )
-
-            # Compute mean feature value across episodes
-            mean_feature_value = np.mean(feature_values)
+                mean_feature_value = _reduce_sum_mean(stacked_states)
 
             # Formatting the values
-            metrics_to_label_dict = _METRICS_TO_LABEL_DICT[feature]
-
-            eval_metrics[metrics_to_label_dict[0]] = perform_format(
-                mean_feature_value, metrics_to_label_dict[1]
+            eval_metrics[label] = perform_format(
+                mean_feature_value, num_decimal_places
             )
 
         success = True
@@ -246,44 +451,36 @@ def val_metrics(trainer, logged_ts, framework, num_episodes=1):
     ), f"Invalid framework {framework}, should be in f{available_frameworks}."
 
     # Fetch all the desired outputs to compute various metrics.
-    desired_outputs = list(_METRICS_TO_LABEL_DICT.keys())
+    desired_outputs = list(_DESIRED_OUTPUTS)
     episode_states = {}
     eval_metrics = {}
     try:
         for episode_id in range(num_episodes):
             episode_states[episode_id] = logged_ts
             
-        for feature in desired_outputs:
-            feature_values = [None for _ in range(num_episodes)]
-
-            if feature == "global_temperature":
-                # Get the temp rise for upper strata
-                for episode_id in range(num_episodes):
-                    feature_values[episode_id] = (
-                        episode_states[episode_id][feature][-1, 0]
-                        - episode_states[episode_id][feature][0, 0]
-                    )
-
-            elif feature == "global_carbon_mass":
-                for episode_id in range(num_episodes):
-                    feature_values[episode_id] = episode_states[episode_id][feature][
-                        -1, 0
-                    ]
-
-            else:
-                for episode_id in range(num_episodes):
-                    feature_values[episode_id] = np.sum(
-                        episode_states[episode_id][feature]
+        # Walk each episode once, accumulating every feature reduction in a
+        # single pass instead of one traversal of the states per feature.
+        total_feature_values = dict.fromkeys(desired_outputs, 0.0)
+        for episode_id in range(num_episodes):
+            episode_state = episode_states[episode_id]
+            for feature in desired_outputs:
+                if feature == "global_temperature":
+                    # Get the temp rise for upper strata
+                    total_feature_values[feature] += (
+                        episode_state[feature][-1, 0] - episode_state[feature][0, 0]
                     )
+                elif feature == "global_carbon_mass":
+                    total_feature_values[feature] += episode_state[feature][-1, 0]
+                else:
+                    total_feature_values[feature] += np.sum(episode_state[feature])
 
+        for feature, (label, num_decimal_places) in _LABEL_ITEMS:
             # Compute mean feature value across episodes
-            mean_feature_value = np.mean(feature_values)
+            mean_feature_value = total_feature_values[feature] / num_episodes
 
             # Formatting the values
-            metrics_to_label_dict = _METRICS_TO_LABEL_DICT[feature]
-
-            eval_metrics[metrics_to_label_dict[0]] = perform_format(
-                mean_feature_value, metrics_to_label_dict[1]
+            eval_metrics[label] = perform_format(
+                mean_feature_value, num_decimal_places
             )
 
         success = True
@@ -301,15 +498,28 @@ def perform_format(val, num_decimal_places):
     """
     Format value to the number of desired decimal points.
     """
-    if np.isnan(val):
+    val = float(val)
+    if math.isnan(val):
         return val
     assert num_decimal_places >= 0
-    rounded_val = np.round(val, num_decimal_places)
+    rounded_val = _round_scalar(val, num_decimal_places)
     if num_decimal_places == 0:
         return int(rounded_val)
     return rounded_val
 
 
+@functools.lru_cache(maxsize=8)
+def _load_run_config(config_file_path, mtime):
+    """
+    Load and cache a run configuration.
+    The file mtime is part of the cache key, so edits to the yaml
+    invalidate the cached entry.
+    """
+    assert mtime is not None
+    with open(config_file_path, "r", encoding="utf-8") as file_ptr:
+        return yaml.load(file_ptr, Loader=SafeLoader)
+
+
 def perform_evaluation(
     results_directory=None,
     num_episodes=1,
@@ -325,88 +535,134 @@ def perform_evaluation(
     framework, success, comment = validate_dir(results_directory)
     if success:
         logging.info("Running unit tests...")
-        this_file_dir = os.path.dirname(os.path.abspath(__file__))
 
         try:
-            subprocess.check_output(
-                [
-                    "python",
-                    os.path.join(this_file_dir, "run_unittests.py"),
-                    "--results_dir",
-                    results_directory,
-                ],
-            )
+            # Run the unit tests in-process; spawning a fresh interpreter
+            # would pay the full import cold-start for every evaluation.
+            import run_unittests
+
+            if not run_unittests.main(results_directory):
+                raise RuntimeError("Unit tests failed.")
             logging.info("DONE")
+        except Exception as err:
+            logging.error(err)
+            success = False
+            comment = "Unit tests were not successful."
 
-            if success:
-                (
-                    create_trainer,
-                    load_model_checkpoints,
-                    fetch_episode_states,
-                ) = get_imports(framework=framework)
+        if success:
+            (
+                create_trainer,
+                load_model_checkpoints,
+                fetch_episode_states,
+                fetch_episode_states_batched,
+            ) = get_imports(framework=framework)
 
-                logging.info("Performing eval...")
+            logging.info("Performing eval...")
 
-                # Load a run configuration
-                config_file = os.path.join(results_directory, f"rice_{framework}.yaml")
+            # Load a run configuration
+            config_file = os.path.join(results_directory, f"rice_{framework}.yaml")
 
-                if not os.path.exists(config_file):
-                    success = False
-                    comment = (
-                        f"The run configuration is missing in {results_directory}."
-                    )
+            if not os.path.exists(config_file):
+                success = False
+                comment = (
+                    f"The run configuration is missing in {results_directory}."
+                )
 
-                else:
-                    with open(config_file, "r", encoding="utf-8") as file_ptr:
-                        run_config = yaml.safe_load(file_ptr)
+            else:
+                # Deep-copy the cached config, since trainer creation
+                # may mutate it (e.g., to set the seed).
+                run_config = copy.deepcopy(
+                    _load_run_config(config_file, os.path.getmtime(config_file))
+                )
+
+                # Create trainer object
+                try:
+                    trainer, _ = create_trainer(
+                        run_config, source_dir=results_directory, seed=eval_seed
+                    )
 
-                    # Create trainer object
+                    # Load model checkpoints
                     try:
-                        trainer, _ = create_trainer(
-                            run_config, source_dir=results_directory, seed=eval_seed
-                        )
+                        load_model_checkpoints(trainer, results_directory)
 
-                        # Load model checkpoints
+                        # Compute metrics
                         try:
-                            load_model_checkpoints(trainer, results_directory)
-
-                            # Compute metrics
-                            try:
-                                success, comment, eval_metrics = compute_metrics(
-                                    fetch_episode_states,
-                                    trainer,
-                                    framework,
-                                    num_episodes=num_episodes,
+                            # Optionally memoize the rollouts on disk, so
+                            # repeated evals of the same checkpoints and
+                            # seed skip the rollout phase entirely.
+                            cache_key = None
+                            if os.getenv("RICE_EVAL_CACHE") == "1":
+                                cache_key = _episode_cache_key(
+                                    results_directory, eval_seed
                                 )
 
-                                if framework == "warpdrive":
-                                    trainer.graceful_close()
-                                logging.info("DONE!")
-
-                            except Exception as err:
-                                logging.error(err)
-                                success = False
-                                comment = "Count not fetch episode and compute metrics."
+                            success, comment, eval_metrics = compute_metrics(
+                                fetch_episode_states,
+                                trainer,
+                                framework,
+                                num_episodes=num_episodes,
+                                fetch_episode_states_batched=(
+                                    fetch_episode_states_batched
+                                ),
+                                cache_key=cache_key,
+                            )
+
+                            if framework == "warpdrive":
+                                trainer.graceful_close()
+                            logging.info("DONE!")
 
                         except Exception as err:
                             logging.error(err)
                             success = False
-                            comment = "Could not load model checkpoints."
+                            comment = "Count not fetch episode and compute metrics."
 
                     except Exception as err:
                         logging.error(err)
                         success = False
-                        comment = (
-                            "Could not create trainer with the run_config provided."
-                        )
-        except subprocess.CalledProcessError as err:
-            logging.error(err)
-            success = False
-            comment = "Unit tests were not successful."
+                        comment = "Could not load model checkpoints."
+
+                except Exception as err:
+                    logging.error(err)
+                    success = False
+                    comment = (
+                        "Could not create trainer with the run_config provided."
+                    )
 
     return framework, success, eval_metrics, comment
 
 
+def perform_evaluations(
+    results_directories=None,
+    num_episodes=1,
+    eval_seed=None,
+    num_workers=None,
+):
+    """
+    Evaluate multiple submissions in parallel worker processes.
+    Evaluating a submission imports its rice/rice_helpers modules into
+    the worker's sys.modules, so workers are never reused across
+    submissions (maxtasksperchild=1): each evaluation gets a fresh
+    spawned interpreter and cannot see another submission's env code.
+    The 'spawn' start method is also required since CUDA contexts do not
+    survive a fork. To pin warpdrive workers to distinct GPUs, set
+    CUDA_VISIBLE_DEVICES in the environment before spawning.
+    """
+    assert results_directories is not None
+    assert len(results_directories) > 0
+    if num_workers is None:
+        num_workers = min(len(results_directories), os.cpu_count() or 1)
+
+    worker_fn = functools.partial(
+        perform_evaluation,
+        num_episodes=num_episodes,
+        eval_seed=eval_seed,
+    )
+    with multiprocessing.get_context("spawn").Pool(
+        num_workers, maxtasksperchild=1
+    ) as pool:
+        return pool.map(worker_fn, results_directories)
+
+
 if __name__ == "__main__":
     logging.info("This script performs evaluation of your code.")
     results_dir = get_results_dir()[0]
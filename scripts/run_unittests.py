@@ -260,10 +260,27 @@ class TestEnv(unittest.TestCase):
             # Execute the CPU-GPU consistency checks
             os.chdir(self.results_dir)
             subprocess.check_output(
-                ["python", "scripts/run_cpu_gpu_env_consistency_checks.py"]
+                [sys.executable, "scripts/run_cpu_gpu_env_consistency_checks.py"]
             )
 
 
+def main(results_dir=None):
+    """
+    Run the env unit tests in-process and report whether they all passed.
+    """
+    assert results_dir is not None
+    TestEnv.results_dir = results_dir
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestEnv)
+    # Some tests chdir into the results directory; restore the cwd so an
+    # in-process run does not change it for the calling evaluator.
+    prev_dir = os.getcwd()
+    try:
+        result = unittest.TextTestRunner(verbosity=0).run(suite)
+    finally:
+        os.chdir(prev_dir)
+    return result.wasSuccessful()
+
+
 if __name__ == "__main__":
     logging.info("Running env unit tests...")
 
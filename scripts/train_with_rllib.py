@@ -465,7 +465,7 @@ def trainer(
     # ---------------------------------
     subprocess.call(
         [
-            "python",
+            sys.executable,
             os.path.join(PUBLIC_REPO_DIR, "scripts", "create_submission_zip.py"),
             "--results_dir",
             save_dir,
@@ -544,7 +544,7 @@ if __name__ == "__main__":
     # ---------------------------------
     subprocess.call(
         [
-            "python",
+            sys.executable,
             os.path.join(PUBLIC_REPO_DIR, "scripts", "create_submission_zip.py"),
             "--results_dir",
             save_dir,
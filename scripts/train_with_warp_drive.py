@@ -147,6 +147,39 @@ def fetch_episode_states(trainer_obj=None, episode_states=None, env_id=None):
     return trainer_obj.fetch_episode_states(episode_states, env_id)
 
 
+def fetch_episode_states_batched(trainer_obj=None, episode_states=None, num_episodes=1):
+    """
+    Helper function to fetch env states for multiple episodes.
+    Uses a trainer-level batched fetch when the trainer provides one;
+    otherwise fetches a distinct env replica per episode so the episodes
+    are decorrelated. When the rollout has fewer env replicas than
+    requested episodes, fetch the default replica once per episode,
+    matching the single-episode behavior.
+    """
+    assert trainer_obj is not None
+    assert isinstance(
+        episode_states, list
+    ), "Please pass the 'episode states' args as a list."
+    assert len(episode_states) > 0
+    assert num_episodes > 0
+
+    # Prefer a trainer-level batched fetch when available.
+    batch_fetcher = getattr(trainer_obj, "fetch_episode_states_batch", None)
+    if batch_fetcher is not None:
+        return batch_fetcher(episode_states, num_episodes)
+
+    num_envs = getattr(trainer_obj.cuda_envs, "n_envs", 1)
+    if num_episodes > num_envs:
+        return [
+            trainer_obj.fetch_episode_states(episode_states)
+            for _ in range(num_episodes)
+        ]
+    return [
+        trainer_obj.fetch_episode_states(episode_states, env_id)
+        for env_id in range(num_episodes)
+    ]
+
+
 def copy_source_files(trainer):
     """
     Copy source files to the saving directory.
@@ -223,7 +256,7 @@ def trainer(
     # ---------------------------------
     subprocess.call(
         [
-            "python",
+            sys.executable,
             os.path.join(PUBLIC_REPO_DIR, "scripts", "create_submission_zip.py"),
             "--results_dir",
             trainer_object.save_dir,
@@ -280,7 +313,7 @@ if __name__ == "__main__":
     # ---------------------------------
     subprocess.call(
         [
-            "python",
+            sys.executable,
             os.path.join(PUBLIC_REPO_DIR, "scripts", "create_submission_zip.py"),
             "--results_dir",
             trainer_object.save_dir,
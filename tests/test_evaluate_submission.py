@@ -0,0 +1,123 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+_path = Path(os.path.abspath(__file__))
+PUBLIC_REPO_DIR = str(_path.parent.parent.absolute())
+sys.path.append(os.path.join(PUBLIC_REPO_DIR, "scripts"))
+
+from evaluate_submission import compute_metrics, perform_format, validate_dir
+
+
+def _fake_fetch_episode_states(trainer, desired_outputs):
+    episode_states = {}
+    for feature in desired_outputs:
+        if feature == "global_temperature":
+            episode_states[feature] = np.array([[1.0, 0.5], [2.0, 1.0], [4.0, 2.0]])
+        elif feature == "global_carbon_mass":
+            episode_states[feature] = np.array([[800.0], [900.0], [1000.0]])
+        else:
+            episode_states[feature] = np.full((3, 2), 2.0)
+    return episode_states
+
+
+def test_compute_metrics():
+    success, comment, eval_metrics = compute_metrics(
+        _fake_fetch_episode_states,
+        trainer=object(),
+        framework="rllib",
+        num_episodes=3,
+    )
+    assert success
+    assert comment == "Successful submission"
+    # Temperature rise: last minus first value of the upper strata
+    assert eval_metrics["Temperature Rise"] == 3.0
+    # Carbon mass: last value
+    assert eval_metrics["Carbon Mass"] == 1000
+    # All other metrics: sum over the episode
+    assert eval_metrics["Episode Reward"] == 12.0
+
+
+def test_compute_metrics_batched():
+    def fake_fetch_batched(trainer, desired_outputs, num_episodes):
+        return [
+            _fake_fetch_episode_states(trainer, desired_outputs)
+            for _ in range(num_episodes)
+        ]
+
+    success, _, eval_metrics = compute_metrics(
+        None,
+        trainer=object(),
+        framework="warpdrive",
+        num_episodes=3,
+        fetch_episode_states_batched=fake_fetch_batched,
+    )
+    assert success
+    assert eval_metrics["Temperature Rise"] == 3.0
+    assert eval_metrics["Carbon Mass"] == 1000
+
+
+def test_compute_metrics_episode_cache(tmp_path, monkeypatch):
+    import evaluate_submission
+
+    monkeypatch.setattr(evaluate_submission, "_EPISODE_CACHE_DIR", str(tmp_path))
+
+    num_fetches = []
+
+    def counting_fetch(trainer, desired_outputs):
+        num_fetches.append(1)
+        return _fake_fetch_episode_states(trainer, desired_outputs)
+
+    success, _, first_metrics = compute_metrics(
+        counting_fetch,
+        trainer=object(),
+        framework="rllib",
+        num_episodes=2,
+        cache_key="abc_1234",
+    )
+    assert success
+    assert len(num_fetches) == 2
+
+    # The second run should be served entirely from the on-disk cache.
+    success, _, second_metrics = compute_metrics(
+        counting_fetch,
+        trainer=object(),
+        framework="rllib",
+        num_episodes=2,
+        cache_key="abc_1234",
+    )
+    assert success
+    assert len(num_fetches) == 2
+    assert first_metrics == second_metrics
+
+
+def test_validate_dir(tmp_path):
+    # Missing identifier file
+    framework, success, comment = validate_dir(str(tmp_path))
+    assert framework is None
+    assert not success
+    assert comment == "Missing identifier file!"
+
+    # Identifier present, but required files missing
+    (tmp_path / ".rllib").touch()
+    framework, success, comment = validate_dir(str(tmp_path))
+    assert framework == "rllib"
+    assert not success
+    assert "is not present in the results directory!" in comment
+
+    # Valid submission
+    for file in ["rice.py", "rice_helpers.py", "rice_rllib.yaml"]:
+        (tmp_path / file).touch()
+    framework, success, comment = validate_dir(str(tmp_path))
+    assert framework == "rllib"
+    assert success
+    assert comment == "Valid submission"
+
+
+def test_perform_format():
+    assert perform_format(3.14159, 2) == 3.14
+    assert perform_format(3.6, 0) == 4
+    assert isinstance(perform_format(3.6, 0), int)
+    assert np.isnan(perform_format(np.nan, 2))
@@ -1,6 +1,7 @@
 import os
 import re
 import subprocess
+import sys
 from pathlib import Path
 
 _path = Path(os.path.abspath(__file__))
@@ -11,7 +12,7 @@ os.chdir(PUBLIC_REPO_DIR)
 def test_training_run():
     env = os.environ.copy()
     env["CONFIG_FILE"] = "./tests/rice_rllib_test.yaml"
-    command = subprocess.run(["python", "./scripts/train_with_rllib.py"],
+    command = subprocess.run([sys.executable, "./scripts/train_with_rllib.py"],
                              env=env,
                              capture_output=True)
     assert command.returncode == 0